@@ -1,23 +1,130 @@
 import argparse
+import asyncio
+import atexit
 import json
 import logging
 import os
+import queue
+import random
 import sqlite3
 import sys
+import threading
 import time
-import textwrap
 import csv
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from functools import partial
-from multiprocessing import Manager, Pool
+from itertools import groupby
+from operator import itemgetter
 
-from tabulate import tabulate
 from tqdm import tqdm
 from unstract.api_deployments.client import APIDeploymentsClient
 
+# orjson is optional, it (de)serializes the (possibly large) API results faster.
+# Its decode errors subclass json.JSONDecodeError, so callers handle both alike.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":"))
+
 logger = logging.getLogger(__name__)
 
+# Execution statuses after which a file is no longer polled
+TERMINAL_STATUSES = frozenset(("COMPLETED", "ERROR"))
+
+# Full row write, used whenever the result of a file is available
+_SQL_FULL = """
+    INSERT INTO file_status (file_name, execution_status, result, time_taken, status_code, status_api_endpoint, total_embedding_cost, total_embedding_tokens, total_llm_cost, total_llm_tokens, error_message, updated_at, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(file_name) DO UPDATE SET
+        execution_status = excluded.execution_status,
+        result = excluded.result,
+        time_taken = excluded.time_taken,
+        status_code = excluded.status_code,
+        status_api_endpoint = excluded.status_api_endpoint,
+        total_embedding_cost = excluded.total_embedding_cost,
+        total_embedding_tokens = excluded.total_embedding_tokens,
+        total_llm_cost = excluded.total_llm_cost,
+        total_llm_tokens = excluded.total_llm_tokens,
+        error_message = excluded.error_message,
+        updated_at = excluded.updated_at
+"""
+
+# Reset a file to STARTING before a fresh API call, clearing the previous run
+_SQL_START = """
+    INSERT INTO file_status (file_name, execution_status, updated_at, created_at)
+    VALUES (?, 'STARTING', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(file_name) DO UPDATE SET
+        execution_status = 'STARTING',
+        result = NULL,
+        time_taken = NULL,
+        status_code = NULL,
+        status_api_endpoint = NULL,
+        total_embedding_cost = NULL,
+        total_embedding_tokens = NULL,
+        total_llm_cost = NULL,
+        total_llm_tokens = NULL,
+        error_message = NULL,
+        updated_at = excluded.updated_at
+"""
+
+# Narrow status-only write for intermediate polls
+_SQL_POLL = "UPDATE file_status SET execution_status = ?, status_code = ?, status_api_endpoint = ?, updated_at = CURRENT_TIMESTAMP WHERE file_name = ?"
+
+# Settings which SQLite keeps per connection, unlike journal_mode=WAL which
+# is persisted in the DB file, so they're applied to every connection
+_CONN_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+# Columns of the detailed report with their width
+_REPORT_COLUMNS = (
+    ("File Name", 60),
+    ("Execution Status", 20),
+    ("Time Elapsed (seconds)", 22),
+    ("Total Embedding Cost", 20),
+    ("Total Embedding Tokens", 22),
+    ("Total LLM Cost", 20),
+    ("Total LLM Tokens", 20),
+    ("Error Message", 50),
+)
+_REPORT_HEADERS = [header for header, _ in _REPORT_COLUMNS]
+_REPORT_WIDTHS = [width for _, width in _REPORT_COLUMNS]
+# Pads every cell of a row to its column width in a single format call
+_REPORT_ROW_FORMAT = " | ".join(f"{{:<{width}}}" for width in _REPORT_WIDTHS)
+# Characters of an error message shown in the report
+_REPORT_ERROR_EXCERPT = 100
+# Whitespace which would break a report row across lines, mapped to spaces
+_REPORT_WHITESPACE = str.maketrans("\t\n\v\f\r", "     ")
+
+# Max files listed together off the event loop, and how long to keep listing
+# before handing over the files found so far
+_LIST_BATCH_SIZE = 1000
+_LIST_BATCH_WINDOW = 0.05
+
+# SQLite connection and API client reused by everything run on a thread.
+# The connection is only used for reads, all writes go through _write_q.
+_local = threading.local()
+
+# (sql, params) of the DB writes, applied in order by the _db_writer thread
+_write_q = queue.Queue()
+
+# Max writes committed together, and how long to wait for a batch to fill up
+_WRITE_BATCH_SIZE = 100
+_WRITE_BATCH_WINDOW = 0.05
+
 
 # Dataclass for arguments
 @dataclass
@@ -29,6 +136,7 @@ class Arguments:
     input_folder_path: str = ""
     db_path: str = ""
     parallel_call_count: int = 5
+    max_in_flight: int = 0
     recurse_input_folder: bool = False
     retry_failed: bool = False
     retry_pending: bool = False
@@ -43,7 +151,7 @@ class Arguments:
 
 # Initialize SQLite DB
 def init_db(args: Arguments):
-    conn = sqlite3.connect(args.db_path)
+    conn = sqlite3.connect(args.db_path, timeout=5.0, isolation_level=None)
     c = conn.cursor()
 
     # Create the table if it doesn't exist
@@ -61,8 +169,8 @@ def init_db(args: Arguments):
                     total_llm_cost REAL,
                     total_llm_tokens INTEGER,
                     error_message TEXT,
-                    updated_at TEXT,
-                    created_at TEXT
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )"""
     )
 
@@ -84,19 +192,147 @@ def init_db(args: Arguments):
         if column not in existing_columns:
             c.execute(f"ALTER TABLE file_status ADD COLUMN {column} {col_type}")
 
+    # Lets the summary count rows per status without scanning the table
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_file_status_exec ON file_status(execution_status)"
+    )
+
+    # WAL is persisted in the DB file, so every later connection picks it up
+    # and readers no longer block the writer
+    c.execute("PRAGMA journal_mode=WAL")
+
     conn.commit()
     conn.close()
 
-# Check if the file is already processed
-def skip_file_processing(file_name, args: Arguments):
-    conn = sqlite3.connect(args.db_path)
-    c = conn.cursor()
-    c.execute(
-        "SELECT execution_status FROM file_status WHERE file_name = ?", (file_name,)
-    )
-    row = c.fetchone()
+
+# Log executed statements, installed on the connection only for DEBUG runs
+def _trace_cb(statement):
+    if statement.strip() not in ("BEGIN", "COMMIT"):
+        logger.debug(f"Executing statement: {statement}")
+
+
+# Open a connection to the DB with the per connection settings applied
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=5, isolation_level=None)
+    for pragma in _CONN_PRAGMAS:
+        conn.execute(pragma)
+    if logger.isEnabledFor(logging.DEBUG):
+        conn.set_trace_callback(_trace_cb)
+    return conn
+
+
+# Get the SQLite connection of the current thread, opening it on first use.
+# sqlite3 connections can't be shared across threads, hence the thread-local.
+def _get_conn(args: Arguments):
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect(args.db_path)
+    return conn
+
+
+# Get the API client of the current thread so that its HTTP session, and
+# with it the pooled keep-alive connections, is reused across files
+def _get_client(args: Arguments):
+    client = getattr(_local, "client", None)
+    if client is None:
+        client = APIDeploymentsClient(
+            api_url=args.api_endpoint,
+            api_key=args.api_key,
+            api_timeout=args.api_timeout,
+            logging_level=args.log_level,
+            include_metadata=args.include_metadata,
+            verify=args.verify,
+        )
+        _local.client = client
+    return client
+
+
+# Only the main thread opens a reader connection, worker threads just queue
+# their writes for _db_writer
+@atexit.register
+def _close_conn():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+
+
+# Apply the queued writes on a single connection, committing them in batches,
+# until the None sentinel is received. Having one writer avoids SQLITE_BUSY
+# between the workers and turns many small transactions into one fsync per
+# batch.
+def _db_writer(db_path):
+    conn = _connect(db_path)
+
+    stopping = False
+    while not stopping:
+        batch = []
+        item = _write_q.get()
+        deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= _WRITE_BATCH_SIZE:
+                break
+            try:
+                item = _write_q.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+        else:
+            stopping = True
+
+        if batch:
+            _apply_writes(conn, batch)
+
     conn.close()
 
+
+def _apply_writes(conn, batch):
+    try:
+        conn.execute("BEGIN")
+        # Consecutive writes of the same kind, like the STARTING rows of
+        # files dispatched together, are applied with a single executemany
+        for sql, group in groupby(batch, key=itemgetter(0)):
+            params_list = [params for _, params in group]
+            try:
+                conn.executemany(sql, params_list)
+            except sqlite3.Error:
+                # Apply them one by one so that a bad write doesn't drop the rest
+                for params in params_list:
+                    try:
+                        conn.execute(sql, params)
+                    except sqlite3.Error as e:
+                        logger.error(f"Failed to write to DB: {e}: {sql} {params}")
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        logger.error(f"Failed to commit {len(batch)} DB writes: {e}")
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+
+
+def start_db_writer(args: Arguments):
+    writer = threading.Thread(target=_db_writer, args=(args.db_path,), daemon=True)
+    writer.start()
+    return writer
+
+
+# Wait for the writer to commit every queued write and close its connection
+def stop_db_writer(writer):
+    _write_q.put(None)
+    writer.join()
+
+
+# Fetch the stored (execution_status, status_api_endpoint) of all files keyed
+# by file name, in a single pass over the table
+def _fetch_states(args: Arguments):
+    return {
+        file_name: (execution_status, status_api_endpoint)
+        for file_name, execution_status, status_api_endpoint in _get_conn(args).execute(
+            "SELECT file_name, execution_status, status_api_endpoint FROM file_status"
+        )
+    }
+
+
+# Check if the file is already processed
+def skip_file_processing(file_name, row, args: Arguments):
     if not row:
         if args.skip_unprocessed:
             logger.warning(f"[{file_name}] Skipping due to the flag `skip_unprocessed`")
@@ -133,46 +369,45 @@ def update_db(
     total_llm_tokens = None
     error_message = None
 
-    if result is not None:
+    # Costs and tokens are only part of the result when metadata is included
+    if result is not None and args.include_metadata:
         total_embedding_cost, total_llm_cost, total_embedding_tokens, total_llm_tokens = calculate_cost_and_tokens(result)
 
     if execution_status == "ERROR":
         error_message = extract_error_message(result)
 
-    conn = sqlite3.connect(args.db_path)
-    conn.set_trace_callback(
-        lambda x: (
-            logger.debug(f"[{file_name}] Executing statement: {x}")
-            if x.strip() not in ["BEGIN", "COMMIT"]
-            else None
+    _write_q.put(
+        (
+            _SQL_FULL,
+            (
+                file_name,
+                execution_status,
+                _dumps(result),
+                time_taken,
+                status_code,
+                status_api_endpoint,
+                total_embedding_cost,
+                total_embedding_tokens,
+                total_llm_cost,
+                total_llm_tokens,
+                error_message,
+            ),
         )
     )
-    c = conn.cursor()
-    now = datetime.now().isoformat()
-    c.execute(
-        """
-        INSERT OR REPLACE INTO file_status (file_name, execution_status, result, time_taken, status_code, status_api_endpoint, total_embedding_cost, total_embedding_tokens, total_llm_cost, total_llm_tokens, error_message, updated_at, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE((SELECT created_at FROM file_status WHERE file_name = ?), ?))
-        """,
-        (
-            file_name,
-            execution_status,
-            json.dumps(result),
-            time_taken,
-            status_code,
-            status_api_endpoint,
-            total_embedding_cost,
-            total_embedding_tokens,
-            total_llm_cost,
-            total_llm_tokens,
-            error_message,
-            now,
-            file_name,
-            now,
-        ),
+
+
+# Mark a file as STARTING without going through the full row write
+def mark_starting(file_name, args: Arguments):
+    _write_q.put((_SQL_START, (file_name,)))
+
+
+# Update only the status columns of an existing row while polling
+def update_status_only(
+    file_name, execution_status, status_code, status_api_endpoint, args: Arguments
+):
+    _write_q.put(
+        (_SQL_POLL, (execution_status, status_code, status_api_endpoint, file_name))
     )
-    conn.commit()
-    conn.close()
 
 # Calculate total cost and tokens for detailed report
 def calculate_cost_and_tokens(result):
@@ -193,7 +428,7 @@ def calculate_cost_and_tokens(result):
     # If extraction_data is a string, attempt to parse it as JSON
     if isinstance(extraction_data, str):
         try:
-            extraction_data = json.loads(extraction_data) if extraction_data else {}
+            extraction_data = _loads(extraction_data) if extraction_data else {}
         except json.JSONDecodeError:
             logger.warning("Failed to decode JSON for extraction data; defaulting to empty dictionary.")
             extraction_data = {}
@@ -234,8 +469,7 @@ def extract_error_message(result):
 
 # Print final summary with count of each status and average time using a single SQL query
 def print_summary(args: Arguments):
-    conn = sqlite3.connect(args.db_path)
-    c = conn.cursor()
+    c = _get_conn(args).cursor()
 
     # Fetch count and average time for each status
     c.execute(
@@ -246,7 +480,6 @@ def print_summary(args: Arguments):
     """
     )
     summary = c.fetchall()
-    conn.close()
 
     # Print the summary
     print("\nFinal Summary:")
@@ -257,8 +490,7 @@ def print_summary(args: Arguments):
 
 
 def print_report(args: Arguments):
-    conn = sqlite3.connect(args.db_path)
-    c = conn.cursor()
+    c = _get_conn(args).cursor()
 
     # Fetch required fields, including total_cost and total_tokens
     c.execute(
@@ -267,61 +499,43 @@ def print_report(args: Arguments):
         FROM file_status
     """
     )
-    report_data = c.fetchall()
-    conn.close()
 
     # Print the summary
     print("\nDetailed Report:")
-    if report_data:
-        # Tabulate the data with column headers
-        headers = [
-            "File Name", 
-            "Execution Status", 
-            "Time Elapsed (seconds)", 
-            "Total Embedding Cost", 
-            "Total Embedding Tokens", 
-            "Total LLM Cost", 
-            "Total LLM Tokens", 
-            "Error Message"
-        ]
-        
-        column_widths = {
-            "File Name": 30,
-            "Execution Status": 20,
-            "Time Elapsed (seconds)": 20,
-            "Total Embedding Cost": 20,
-            "Total Embedding Tokens": 20,
-            "Total LLM Cost": 20,
-            "Total LLM Tokens": 20,
-            "Error Message": 30,
-        }
-
-        formatted_data = []
-        # Format and wrap each row's data to match column widths
-        for row in report_data:
-            formatted_row = []
-            for idx, cell in enumerate(row):
-                header = headers[idx]
-                width = column_widths[header]
-                cell_value = "None" if cell is None else str(cell)
-                if header == "Error Message" and len(cell_value) > 50:
-                    # Truncate long error messages
-                    cell_value = textwrap.fill(cell_value[:100], width=width) + "..."
-                else:
-                    cell_value = textwrap.fill(cell_value, width=width)
-                formatted_row.append(cell_value)
-            formatted_data.append(formatted_row)
-
-        # Print the table
-        print(tabulate(formatted_data, headers=headers, tablefmt="pretty"))
-    else:
+
+    # Rows are streamed from the cursor and printed one per line with fixed
+    # column widths, so the report is never held in memory as a whole
+    row_count = 0
+    for row in c:
+        if row_count == 0:
+            print(format_report_row(_REPORT_HEADERS))
+            print("-+-".join("-" * width for width in _REPORT_WIDTHS))
+        print(format_report_row(row))
+        row_count += 1
+
+    if row_count == 0:
         print("No records found in the database.")
-        
+
     print("\nNote: For more detailed error messages, use the CSV report argument.")
 
+
+# Format a report row on a single line. Line breaks and tabs are turned into
+# spaces, and error messages (often multi-line tracebacks) have their
+# whitespace collapsed. Cells wider than their column overflow it, except for
+# long error messages which are cut down to an excerpt.
+def format_report_row(row):
+    cells = [
+        "None" if cell is None else str(cell).translate(_REPORT_WHITESPACE)
+        for cell in row
+    ]
+    cells[-1] = " ".join(cells[-1].split())
+    if len(cells[-1]) > _REPORT_ERROR_EXCERPT:
+        cells[-1] = cells[-1][:_REPORT_ERROR_EXCERPT] + "..."
+    return _REPORT_ROW_FORMAT.format(*cells).rstrip()
+
+
 def export_report_to_csv(args: Arguments):
-    conn = sqlite3.connect(args.db_path)
-    c = conn.cursor()
+    c = _get_conn(args).cursor()
 
     c.execute(
         """
@@ -329,8 +543,8 @@ def export_report_to_csv(args: Arguments):
         FROM file_status
         """
     )
-    report_data = c.fetchall()
-    conn.close()
+    # Rows are streamed to the file in chunks rather than loaded all at once
+    report_data = c.fetchmany(1000)
 
     if not report_data:
         print("No data available to export as CSV.")
@@ -347,29 +561,23 @@ def export_report_to_csv(args: Arguments):
         with open(args.csv_report, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(headers)  # Write headers
-            writer.writerows(report_data)  # Write data rows
+            while report_data:
+                writer.writerows(report_data)  # Write data rows
+                report_data = c.fetchmany(1000)
         print(f"CSV successfully exported to '{args.csv_report}'")
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
 
 
-def get_status_endpoint(file_path, client, args: Arguments):
+def get_status_endpoint(file_path, row, args: Arguments):
     """Returns status_endpoint, status and response (if available)"""
     status_endpoint = None
 
     # If retry_pending is True, check if the status API endpoint is available
-    conn = sqlite3.connect(args.db_path)
-    c = conn.cursor()
-    c.execute(
-        "SELECT status_api_endpoint FROM file_status WHERE file_name = ? AND execution_status NOT IN ('COMPLETED', 'ERROR')",
-        (file_path,),
-    )
-    row = c.fetchone()
-    conn.close()
     logger.info(f"Status: {row}")
-    if row:
+    if row and row[0] not in TERMINAL_STATUSES:
         # Use the existing status API endpoint to get the status
-        status_endpoint = row[0]
+        status_endpoint = row[1]
 
     # status_endpoint is only available for pending items. retry_pending will force retry and hence ignore existing.
     if args.retry_pending:
@@ -379,71 +587,86 @@ def get_status_endpoint(file_path, client, args: Arguments):
         logger.info(
             f"[{file_path}] Using the existing status endpoint: {status_endpoint}"
         )
-        return status_endpoint, "PENDING", None
+        return status_endpoint, row[0], None
 
     # Fresh API call to process the file
-    execution_status = "STARTING"
-    update_db(file_path, execution_status, None, None, None, None, args=args)
-    response = client.structure_file(file_paths=[file_path])
+    mark_starting(file_path, args=args)
+    response = _get_client(args).structure_file(file_paths=[file_path])
     logger.debug(f"[{file_path}] Response of initial API call: {response}")
     status_endpoint = response.get(
         "status_check_api_endpoint"
     )  # If ERROR or completed this will be None
     execution_status = response.get("execution_status")
-    status_code = response.get("status_code")
-    update_db(
-        file_path,
-        execution_status,
-        response,
-        None,
-        status_code,
-        status_endpoint,
-        args=args
-    )
     return status_endpoint, execution_status, response
 
 
-def process_file(
-    file_path, success_count, failure_count, skipped_count, args: Arguments
-):
-    logger.info(f"[{file_path}]: Processing started")
+# Check the status of a file once, recording status transitions in the DB
+def poll_status(file_path, status_endpoint, last_status, args: Arguments):
+    response = _get_client(args).check_execution_status(status_endpoint)
+    execution_status = response.get("execution_status")
+    if execution_status != last_status:
+        update_status_only(
+            file_path,
+            execution_status,
+            response.get("status_code"),
+            status_endpoint,
+            args=args,
+        )
+    return response
 
-    # Any file which should be skipped will happen at this point.
-    if skip_file_processing(file_name=file_path, args=args):
-        logger.warning(f"[{file_path}]: Skipping processing.")
-        skipped_count.value += 1
-        return
 
+# Returns the outcome of the file: SUCCESS or FAILURE. Files to skip are
+# filtered out by process_files before they get here.
+#
+# The API client is blocking, so its calls and the DB writes run on the
+# executor whose size bounds the parallel calls, while the waits between
+# polls happen on the event loop and don't hold up a worker.
+async def process_file(file_path, row, args: Arguments, executor):
+    loop = asyncio.get_running_loop()
     start_time = time.time()
     status_code = None
     status_endpoint = None
 
-    try:
-        client = APIDeploymentsClient(
-            api_url=args.api_endpoint,
-            api_key=args.api_key,
-            api_timeout=args.api_timeout,
-            logging_level=args.log_level,
-            include_metadata=args.include_metadata,
-            verify=args.verify,
-        )
+    # The time taken is counted from when a worker thread picks the file up,
+    # not from when it was queued behind the other files
+    def start():
+        nonlocal start_time
+        start_time = time.time()
+        logger.info(f"[{file_path}]: Processing started")
+        return get_status_endpoint(file_path, row, args)
 
-        status_endpoint, execution_status, response = get_status_endpoint(
-            file_path=file_path, client=client, args=args
+    try:
+        status_endpoint, execution_status, response = await loop.run_in_executor(
+            executor, start
         )
-        # Polling until status is COMPLETED or ERROR
-        while execution_status not in ["COMPLETED", "ERROR"]:
-            time.sleep(args.poll_interval)
-            response = client.check_execution_status(status_endpoint)
+        if response is not None:
+            status_code = response.get("status_code")
+            # Record the switch to polling, a terminal response is written below
+            if execution_status not in TERMINAL_STATUSES:
+                update_status_only(
+                    file_path, execution_status, status_code, status_endpoint, args=args
+                )
+
+        # Polling until status is COMPLETED or ERROR, backing off exponentially
+        # from 0.25s up to poll_interval so that quick files finish early. The
+        # jitter keeps files started together from polling in lockstep.
+        # The status returned above is already in the DB.
+        last_status = execution_status
+        delay = min(args.poll_interval, 0.25)
+        while execution_status not in TERMINAL_STATUSES:
+            await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(args.poll_interval, delay * 1.5)
+            # Only status transitions are persisted, the final state is written below
+            response = await loop.run_in_executor(
+                executor, poll_status, file_path, status_endpoint, last_status, args
+            )
             execution_status = response.get("execution_status")
             status_code = response.get("status_code")  # Default to 200 if not provided
-            update_db(
-                file_path, execution_status, None, None, status_code, status_endpoint, args=args
-            )
+            last_status = execution_status
 
         result = response
         logger.debug(f"[{file_path}] Response of final API call: {response}")
-        success_count.value += 1
+        outcome = "SUCCESS"
 
     except Exception as e:
         logger.error(
@@ -453,64 +676,152 @@ def process_file(
         )
         execution_status = "ERROR"
         result = {"error": str(e)}
-        failure_count.value += 1
+        outcome = "FAILURE"
 
     end_time = time.time()
     time_taken = round(end_time - start_time, 2)
-    update_db(
-        file_path, execution_status, result, time_taken, status_code, status_endpoint, args=args
+    await loop.run_in_executor(
+        executor,
+        update_db,
+        file_path,
+        execution_status,
+        result,
+        time_taken,
+        status_code,
+        status_endpoint,
+        args,
     )
     logger.info(f"[{file_path}]: Processing completed: {execution_status}")
+    return outcome
+
+
+# Yield paths of the files in a folder. DirEntry caches the file type read
+# along with the directory listing, so no extra stat() is needed per file.
+# Sub folders are walked from a stack rather than by recursion, so deep trees
+# don't pass every path up through a chain of nested generators.
+def iter_files(folder_path, recursive):
+    folders = [folder_path]
+    while folders:
+        sub_folders = []
+        folder = folders.pop()
+        # Like os.walk, a folder that can't be listed is skipped
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        yield entry.path
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        sub_folders.append(entry.path)
+        except OSError as e:
+            logger.warning(f"[{folder}] Skipping folder, unable to list it: {e}")
+        # Reversed so that sub folders are visited in listing order
+        folders.extend(reversed(sub_folders))
+
+
+# List the next files along with their state and whether they're skipped.
+# Run off the event loop, as listing a large or remote folder blocks, and
+# bounded in size and time so the files found so far are started promptly.
+# An empty batch means every file has been listed.
+def list_files_batch(files, states, args: Arguments):
+    batch = []
+    deadline = time.monotonic() + _LIST_BATCH_WINDOW
+    for file_path in files:
+        # Any file which should be skipped will happen at this point.
+        row = states.get(file_path)
+        skip = skip_file_processing(file_name=file_path, row=row, args=args)
+        batch.append((file_path, row, skip))
+        if len(batch) >= _LIST_BATCH_SIZE or time.monotonic() >= deadline:
+            break
+    return batch
 
 
-def load_folder(args: Arguments):
-    files = []
-    for root, _, filenames in os.walk(args.input_folder_path):
-        for f in filenames:
-            file_path = os.path.join(root, f)
-            if os.path.isfile(file_path):
-                files.append(file_path)
-        if not args.recurse_input_folder:
-            break
-    logger.debug(f"Loaded '{len(files)}' files from '{args.input_folder_path}': {files}")
-
-    with Manager() as manager, Pool(args.parallel_call_count) as executor:
-        success_count = manager.Value("i", 0)  # Shared integer for success count
-        failure_count = manager.Value("i", 0)  # Shared integer for failure count
-        skipped_count = manager.Value("i", 0)  # Shared integer for skipped count
-
-        desc = f"\033[92mSUCCESS: {success_count.value}\033[0m, \033[91mFAILURES: {failure_count.value}\033[0m, \033[93mSKIPPED: {skipped_count.value}\033[0m"
-        pbar = tqdm(
-            total=len(files),
-            colour="blue",
-            desc=desc,
-            mininterval=0.1,
-            maxinterval=2,
-            miniters=1,
-        )
+# Colored progress bar description with the count of each outcome
+def progress_desc(counts):
+    return f"\033[92mSUCCESS: {counts['SUCCESS']}\033[0m, \033[91mFAILURES: {counts['FAILURE']}\033[0m, \033[93mSKIPPED: {counts['SKIPPED']}\033[0m"
 
-        process_file_partial = partial(
-            process_file,
-            success_count=success_count,
-            failure_count=failure_count,
-            skipped_count=skipped_count,
-            args=args,
-        )
 
-        for _ in executor.imap_unordered(process_file_partial, files):
-            pbar.desc = f"\033[92mSUCCESS: {success_count.value}\033[0m, \033[91mFAILURES: {failure_count.value}\033[0m, \033[93mSKIPPED: {skipped_count.value}\033[0m"
-            pbar.update()
-            pbar.refresh()
+# Process the files concurrently as they are listed, tallying the outcomes.
+# At most max_in_flight files are started ahead, so the folder is consumed
+# lazily rather than submitting every file up front.
+async def process_files(files, states, args: Arguments, counts, pbar):
+    loop = asyncio.get_running_loop()
+    # Most files in flight are just waiting between status polls, only
+    # parallel_call_count of them make an API call at any time
+    max_in_flight = max(args.max_in_flight, args.parallel_call_count)
+
+    def record(outcome):
+        counts[outcome] += 1
+        # tqdm redraws on update(), throttled by mininterval
+        pbar.set_description_str(progress_desc(counts), refresh=False)
+        pbar.update()
+
+    async def wait_for_any(tasks):
+        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            record(task.result())
             logger.debug("Got an update")
+        return tasks
+
+    executor = ThreadPoolExecutor(max_workers=args.parallel_call_count)
+    tasks = set()
+    try:
+        # The listing runs on the default executor, not the API one, so it
+        # doesn't queue behind the API calls
+        while batch := await loop.run_in_executor(
+            None, list_files_batch, files, states, args
+        ):
+            for file_path, row, skip in batch:
+                if skip:
+                    logger.warning(f"[{file_path}]: Skipping processing.")
+                    record("SKIPPED")
+                    continue
+
+                if len(tasks) >= max_in_flight:
+                    tasks = await wait_for_any(tasks)
+                tasks.add(
+                    asyncio.create_task(process_file(file_path, row, args, executor))
+                )
+
+        while tasks:
+            tasks = await wait_for_any(tasks)
+    finally:
+        # On Ctrl+C drop the queued calls instead of running them on shutdown,
+        # otherwise files would keep being submitted after the interrupt
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_folder(args: Arguments):
+    files = iter_files(args.input_folder_path, args.recurse_input_folder)
+    counts = Counter()  # Count of each outcome returned by process_file
+
+    # The number of files isn't known upfront as they are listed lazily
+    pbar = tqdm(
+        colour="blue",
+        desc=progress_desc(counts),
+        unit="file",
+        mininterval=0.1,
+        maxinterval=2,
+        miniters=1,
+    )
 
-        pbar.close()
+    asyncio.run(process_files(files, _fetch_states(args), args, counts, pbar))
+
+    pbar.close()
+    logger.debug(f"Loaded '{pbar.n}' files from '{args.input_folder_path}'")
 
 
 def api_deployment_batch_run(args: Arguments):
     logger.warning(f"Running with params: {args}")
     init_db(args=args)  # Initialize DB
+    writer = start_db_writer(args=args)
 
-    load_folder(args=args)
+    try:
+        load_folder(args=args)
+    finally:
+        # Keep whatever was processed, even if the run was interrupted
+        stop_db_writer(writer)
 
     print_summary(args=args)  # Print summary at the end
     if args.print_report:
@@ -556,7 +867,7 @@ def main():
         dest="poll_interval",
         type=int,
         default=5,
-        help="Time in seconds the process will sleep between polls in async mode (default: 5)",
+        help="Maximum time in seconds the process will sleep between polls in async mode, polls back off from 0.25s up to this (default: 5)",
     )
     parser.add_argument(
         "-f",
@@ -572,7 +883,14 @@ def main():
         dest="parallel_call_count",
         type=int,
         default=5,
-        help="Number of calls to be made in parallel (default: 5)",
+        help="Number of API calls to be made in parallel (default: 5)",
+    )
+    parser.add_argument(
+        "--max_in_flight",
+        dest="max_in_flight",
+        type=int,
+        default=0,
+        help="Maximum number of files being processed on the server at once, files waiting between status polls don't hold up a parallel call (default: same as --parallel_call_count)",
     )
     parser.add_argument(
         "--db_path",